@@ -1,4 +1,7 @@
-import pygame
+try:
+    import pygame
+except ImportError:  # 无界面统计模式不需要 pygame
+    pygame = None
 import random
 import math
 import sys
@@ -30,11 +33,15 @@ class CircularBoard:
 
     def reset(self):
         self.positions = [[] for _ in range(GRID_COUNT)]
+        self.player_pos = {}
+        self.player_slot = {}  # 玩家在所在格子堆叠中的下标
         self.winner = None
         self.total_steps = {p: 0 for p in PLAYERS}
 
     def add_player(self, player, position):
+        self.player_slot[player] = len(self.positions[position])
         self.positions[position].append(player)
+        self.player_pos[player] = position
 
     def move_player(self, player, steps, is_solo=False):
         if self.winner:
@@ -49,37 +56,69 @@ class CircularBoard:
             self.winner = player
             return
 
-        new_idx = (current_idx + steps) % GRID_COUNT
+        # 单次步数远小于格子数，减一次即可回绕
+        new_idx = current_idx + steps
+        if new_idx >= GRID_COUNT:
+            new_idx -= GRID_COUNT
         current_stack = self.positions[current_idx]
-        player_index = current_stack.index(player)
+        player_index = self.player_slot[player]
 
         move_stack = [player] if is_solo else current_stack[player_index:]
         del current_stack[player_index:player_index + len(move_stack)]
-        self.positions[new_idx].extend(move_stack)
+        new_stack = self.positions[new_idx]
+        start = len(new_stack)
+        new_stack.extend(move_stack)
+        self._update_slots(current_idx, player_index)
+        self._update_slots(new_idx, start)
+
+    def move_to_top(self, player):
+        idx = self.player_pos.get(player)
+        if idx is None:
+            return
+        stack = self.positions[idx]
+        slot = self.player_slot[player]
+        del stack[slot]
+        stack.append(player)
+        self._update_slots(idx, slot)
+
+    def _update_slots(self, idx, start):
+        stack = self.positions[idx]
+        for i in range(start, len(stack)):
+            p = stack[i]
+            self.player_pos[p] = idx
+            self.player_slot[p] = i
 
     def find_player_position(self, player):
-        for idx, stack in enumerate(self.positions):
-            if player in stack:
-                return idx
-        return None
+        return self.player_pos.get(player)
+
+    def get_stack_index(self, player):
+        return self.player_slot.get(player)
 
     def get_player_stack_size(self, player):
         idx = self.find_player_position(player)
         return len(self.positions[idx]) if idx is not None else 0
 
     def is_last_place(self, player):
-        player_pos = self.find_player_position(player)
-        all_pos = [self.find_player_position(p) for p in PLAYERS if p != player]
-        return all(p >= player_pos for p in all_pos if p is not None)
+        lowest = min(self.player_pos.values(), default=None)
+        return self.player_pos.get(player) == lowest
 
 
 class GameVisualization:
-    def __init__(self, speed=2):
-        pygame.init()
-        self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
-        self.font = pygame.font.Font(None, 24)
+    def __init__(self, speed=2, render=True):
+        self.render = render  # False 时只跑统计，不初始化 pygame
+        if self.render:
+            if pygame is None:
+                raise ImportError("pygame is required for rendering; use render=False")
+            pygame.init()
+            self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
+            self.font = pygame.font.Font(None, 24)
+            # 格子编号和玩家字母不会变化，只渲染一次
+            self._idx_surfaces = [self.font.render(str(i), True, (0, 0, 0)) for i in range(GRID_COUNT)]
+            self._player_surfaces = {p: self.font.render(p, True, (0, 0, 0)) for p in PLAYER_COLORS}
+            self._stat_cache = (None, None)
+            self._speed_cache = (None, None)
+            self.clock = pygame.time.Clock()
         self.board = CircularBoard()
-        self.clock = pygame.time.Clock()
         self.grid_positions = self.calculate_positions()
         self.speed = speed
         self.win_counts = {p: 0 for p in PLAYERS}
@@ -100,25 +139,28 @@ class GameVisualization:
     def draw_board(self):
         self.screen.fill((255, 255, 255))
         for idx, (x, y) in enumerate(self.grid_positions):
-            text = self.font.render(str(idx), True, (0, 0, 0))
-            self.screen.blit(text, (x - 10, y - 10))
+            self.screen.blit(self._idx_surfaces[idx], (x - 10, y - 10))
             players = self.board.positions[idx]
             for i, player in enumerate(players):
                 color = PLAYER_COLORS[player]
                 pos = (x + i * 15, y + i * 15)
                 pygame.draw.circle(self.screen, color, pos, 10)
-                text = self.font.render(player, True, (0, 0, 0))
-                self.screen.blit(text, (pos[0] - 5, pos[1] - 8))
-
-        stats = " | ".join([f"{k}:{v}" for k, v in self.win_counts.items()])
-        stat_text = self.font.render(f"Total Games: {self.total_games}  {stats}", True, (0, 0, 0))
-        self.screen.blit(stat_text, (20, HEIGHT - 40))
-        speed_text = self.font.render(f"Speed: {self.speed} (Up/Down Arrow)", True, (0, 0, 0))
-        self.screen.blit(speed_text, (20, 20))
+                self.screen.blit(self._player_surfaces[player], (pos[0] - 5, pos[1] - 8))
+
+        # 胜场只在一局结束时变化，按总局数缓存统计文字
+        if self._stat_cache[0] != self.total_games:
+            stats = " | ".join([f"{k}:{v}" for k, v in self.win_counts.items()])
+            stat_text = self.font.render(f"Total Games: {self.total_games}  {stats}", True, (0, 0, 0))
+            self._stat_cache = (self.total_games, stat_text)
+        self.screen.blit(self._stat_cache[1], (20, HEIGHT - 40))
+        if self._speed_cache[0] != self.speed:
+            speed_text = self.font.render(f"Speed: {self.speed} (Up/Down Arrow)", True, (0, 0, 0))
+            self._speed_cache = (self.speed, speed_text)
+        self.screen.blit(self._speed_cache[1], (20, 20))
         pygame.display.flip()
 
     def initialize_players(self):
-        self.board.positions = [[] for _ in range(GRID_COUNT)]
+        self.board.reset()
         self.board.add_player('A', 0)
         self.board.add_player('C', 22)
         self.board.add_player('B', 22)
@@ -132,7 +174,8 @@ class GameVisualization:
         is_solo = self.check_solo_move(player)
         self.board.move_player(player, steps, is_solo)
         self.apply_post_skills(player)
-        self.update_display()
+        if self.render:
+            self.update_display()
 
     def roll_dice(self, player):
         if PLAYER_SKILLS[player]['type'] == 'dice_2d3':
@@ -152,30 +195,24 @@ class GameVisualization:
         return steps
 
     def check_solo_move(self, player):
-        return (PLAYER_SKILLS[player]['type'] == 'solo_move'
-                and random.random() < PLAYER_SKILLS[player]['prob'])
+        skill = PLAYER_SKILLS[player]
+        return skill['type'] == 'solo_move' and random.random() < skill['prob']
 
     def apply_post_skills(self, player):
         skill = PLAYER_SKILLS[player]
         if skill['type'] == 'elevate' and random.random() < skill['prob']:
-            idx = self.board.find_player_position(player)
-            if idx is not None:
-                stack = self.board.positions[idx]
-                if player in stack:
-                    stack.remove(player)
-                    stack.append(player)
+            self.board.move_to_top(player)
 
     def adjust_move_order(self, base_order):
         ordered = list(base_order)
-        for i in range(len(base_order)):
-            p = base_order[i]
-            if p == 'C' and PLAYER_SKILLS[p]['type'] == 'late_move':
-                idx = self.board.find_player_position(p)
-                if idx is not None:
-                    stack = self.board.positions[idx]
-                    if stack.index(p) > 0 and random.random() < 0.65:
-                        ordered.append(ordered.pop(i))
-                        break  # 每个回合只调整一次
+        # 只有 C 拥有 late_move 技能，直接定位，每个回合只调整一次
+        try:
+            i = ordered.index('C')
+        except ValueError:
+            return ordered
+        slot = self.board.get_stack_index('C')
+        if slot is not None and slot > 0 and random.random() < 0.65:
+            ordered.append(ordered.pop(i))
         return ordered
 
     def run_game(self):
@@ -185,13 +222,14 @@ class GameVisualization:
         self.initial_order = random.sample(PLAYERS, len(PLAYERS))
 
         while not self.board.winner:
-            # 使用初始顺序的副本进行调整
-            current_order = self.adjust_move_order(self.initial_order.copy())
+            # adjust_move_order 内部会复制，初始顺序不会被修改
+            current_order = self.adjust_move_order(self.initial_order)
             for player in current_order:
                 if self.board.winner:
                     break
                 self.process_turn(player)
-                self.update_display()
+                if self.render:
+                    self.update_display()
 
         if self.board.winner:
             self.win_counts[self.board.winner] += 1
@@ -203,7 +241,7 @@ class GameVisualization:
         pygame.time.delay(int(500 / self.speed))
 
     def show_winner_message(self):
-        if self.board.winner:
+        if self.render and self.board.winner:
             victory_font = pygame.font.Font(None, 72)
             text = victory_font.render(f"Winner: {self.board.winner}!",
                                        True, PLAYER_COLORS[self.board.winner])
@@ -211,24 +249,38 @@ class GameVisualization:
             pygame.display.flip()
             pygame.time.delay(int(1000 / self.speed))
 
-    def auto_simulate(self, max_games=1000):
+    def auto_simulate(self, max_games=1000, render=True):
+        # render=False 只关闭本次模拟的绘制，窗口仍由 __init__ 决定
+        self.render = self.render and render
         running = True
         while running and self.total_games < max_games:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    running = False
-                elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_UP:
-                        self.speed = min(5, self.speed + 1)
-                    elif event.key == pygame.K_DOWN:
-                        self.speed = max(1, self.speed - 1)
+            if self.render:
+                for event in pygame.event.get():
+                    if event.type == pygame.QUIT:
+                        running = False
+                    elif event.type == pygame.KEYDOWN:
+                        if event.key == pygame.K_UP:
+                            self.speed = min(5, self.speed + 1)
+                        elif event.key == pygame.K_DOWN:
+                            self.speed = max(1, self.speed - 1)
 
             self.run_game()
             self.show_winner_message()
 
-        pygame.quit()
+        if pygame is not None and pygame.get_init():
+            pygame.quit()
+
+    @classmethod
+    def run_headless(cls, max_games=1000):
+        game = cls(render=False)
+        while game.total_games < max_games:
+            game.run_game()
+        return game.win_counts
 
 
 if __name__ == "__main__":
-    game = GameVisualization(speed=2)
-    game.auto_simulate(max_games=100)
\ No newline at end of file
+    if "--headless" in sys.argv[1:]:
+        print(GameVisualization.run_headless(max_games=100))
+    else:
+        game = GameVisualization(speed=2)
+        game.auto_simulate(max_games=100)
\ No newline at end of file